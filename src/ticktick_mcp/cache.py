@@ -0,0 +1,64 @@
+"""Small on-disk cache for per-account values that are costly to discover."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from .codec import dumps, loads
+
+CACHE_FILE = Path(
+    os.environ.get("MCP_TICKTICK_CACHE_FILE")
+    or Path.home() / ".ticktick-mcp" / "cache.json"
+)
+
+
+def _account_key(token: str) -> str:
+    """Stable, non-reversible key for the account behind an access token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def load_cache() -> dict:
+    """Read the cache, dropping anything that is not an {account: {key: value}} entry."""
+    try:
+        data = loads(CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+
+def save_cache(data: dict) -> None:
+    """Write the cache atomically; skip the write if nothing changed."""
+    new = dumps(data)
+    try:
+        if CACHE_FILE.read_bytes() == new:
+            return
+    except OSError:
+        pass
+    tmp = None
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=CACHE_FILE.parent, prefix=".cache-", delete=False
+        ) as tmp:
+            tmp.write(new)
+        os.replace(tmp.name, CACHE_FILE)
+    except OSError:
+        # cache is best-effort, but don't leave a stray temp file behind
+        if tmp is not None:
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+
+
+def cache_get(token: str, key: str):
+    return load_cache().get(_account_key(token), {}).get(key)
+
+
+def cache_set(token: str, key: str, value) -> None:
+    data = load_cache()
+    data.setdefault(_account_key(token), {})[key] = value
+    save_cache(data)
@@ -1,44 +1,145 @@
-import json
-import urllib.error
-import urllib.request
+import base64
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
 from .auth import get_access_token
+from .cache import cache_get, cache_set
+from .codec import dumps, loads
 
 API_BASE = "https://api.ticktick.com/open/v1"
 
+_API_URL = urlsplit(API_BASE)
+
+# Endpoint templates, bound once
+_P_PROJECT = "/project/{}".format
+_P_PROJECT_DATA = "/project/{}/data".format
+_P_TASK = "/task/{}".format
+_P_PROJECT_TASK = "/project/{}/task/{}".format
+_P_COMPLETE_TASK = "/project/{}/task/{}/complete".format
+
+_FETCH_WORKERS = 8
+_POOL_SIZE = 8
+_TIMEOUT = 30.0
+_KEEPALIVE_EXPIRY = 30.0  # drop idle connections before the server does
+
+
+def _https_proxy():
+    """(host, port, tunnel_headers) of the HTTPS_PROXY to tunnel through, or None.
+
+    Mirrors what urlopen's default ProxyHandler honored: HTTPS_PROXY / NO_PROXY.
+    """
+    proxy = getproxies().get("https")
+    if not proxy or proxy_bypass(_API_URL.hostname):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    url = urlsplit(proxy)
+    headers = {}
+    if url.username is not None:
+        creds = f"{unquote(url.username)}:{unquote(url.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+    return url.hostname, url.port or (443 if url.scheme == "https" else 80), headers
+
 
 class TickTickClient:
     def __init__(self, client_id, client_secret):
         self._client_id = client_id
         self._client_secret = client_secret
         self._access_token = None
+        self._headers = None
         self._inbox_id = None
+        self._inbox_lock = threading.Lock()
+        self._idle = []  # [(connection, idle_since)] ready for reuse
+        self._proxy = _https_proxy()
 
     def _token(self):
         if not self._access_token:
             self._access_token = get_access_token()
         return self._access_token
 
-    def _do_http(self, method, endpoint, token, body=None):
-        url = f"{API_BASE}{endpoint}"
-        data = json.dumps(body).encode() if body is not None else None
-        req = urllib.request.Request(url, data=data, method=method)
-        req.add_header("Authorization", f"Bearer {token}")
-        req.add_header("Content-Type", "application/json")
+    def _auth_headers(self):
+        """Request headers, built once per access token."""
+        if self._headers is None:
+            self._headers = {
+                "Authorization": f"Bearer {self._token()}",
+                "Content-Type": "application/json",
+            }
+        return self._headers
+
+    def _acquire(self):
+        """Return (connection, reused) — an idle keep-alive connection if any."""
+        now = time.monotonic()
+        while self._idle:
+            try:
+                conn, idle_since = self._idle.pop()
+            except IndexError:
+                break
+            if now - idle_since < _KEEPALIVE_EXPIRY:
+                return conn, True
+            conn.close()
+        if self._proxy is None:
+            conn = http.client.HTTPSConnection(_API_URL.hostname, _API_URL.port, timeout=_TIMEOUT)
+        else:
+            host, port, headers = self._proxy
+            conn = http.client.HTTPSConnection(host, port, timeout=_TIMEOUT)
+            conn.set_tunnel(_API_URL.hostname, _API_URL.port or 443, headers=headers)
+        return conn, False
+
+    def _release(self, conn, res):
+        if res.will_close or len(self._idle) >= _POOL_SIZE:
+            conn.close()
+        else:
+            self._idle.append((conn, time.monotonic()))
+
+    def close(self):
+        """Close all pooled connections."""
+        while self._idle:
+            self._idle.pop()[0].close()
+
+    def _do_http(self, method, endpoint, headers, body=None):
+        path = f"{_API_URL.path}{endpoint}"
+        data = dumps(body) if body is not None else None
+        while True:
+            conn, reused = self._acquire()
+            sent = False
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                sent = True
+                res = conn.getresponse()
+            except TimeoutError:
+                # The request may have reached the server; never resend it
+                conn.close()
+                raise
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                # Resend only if the server never answered: the send failed, or it closed
+                # an idle keep-alive connection instead of responding
+                unanswered = not sent or isinstance(e, (http.client.RemoteDisconnected, BrokenPipeError))
+                if reused and unanswered:
+                    continue
+                raise
+            break
         try:
-            with urllib.request.urlopen(req) as res:
-                raw = res.read()
-                ct = res.headers.get("content-type", "")
-                if "application/json" in ct and raw:
-                    return res.status, json.loads(raw)
-                return res.status, None
-        except urllib.error.HTTPError as e:
-            return e.code, e.read().decode("utf-8", errors="replace")
+            raw = res.read()
+        except (http.client.HTTPException, OSError):
+            # A status line already arrived, so the server handled the request; never resend
+            conn.close()
+            raise
+        self._release(conn, res)
+        if res.status >= 400:
+            return res.status, raw.decode("utf-8", errors="replace")
+        ct = res.getheader("content-type", "")
+        if "application/json" in ct and raw:
+            return res.status, loads(raw)
+        return res.status, None
 
     def _request(self, method, endpoint, body=None):
-        token = self._token()
-        status, data = self._do_http(method, endpoint, token, body)
+        status, data = self._do_http(method, endpoint, self._auth_headers(), body)
         if status >= 400:
             raise Exception(f"TickTick API error {status} {method} {endpoint}: {data}")
         return data
@@ -48,17 +149,25 @@ class TickTickClient:
     def get_inbox_id(self):
         if self._inbox_id:
             return self._inbox_id
-        temp_task = self.create_task({"title": "__ticktick_mcp_inbox_probe__"})
-        self._inbox_id = temp_task["projectId"]
-        try:
-            self.delete_task(temp_task["projectId"], temp_task["id"])
-        except Exception:
-            pass
+        # Serialize discovery so concurrent callers don't each create a probe task
+        with self._inbox_lock:
+            if self._inbox_id:
+                return self._inbox_id
+            inbox_id = cache_get(self._token(), "inboxId")
+            if not inbox_id:
+                temp_task = self.create_task({"title": "__ticktick_mcp_inbox_probe__"})
+                inbox_id = temp_task["projectId"]
+                try:
+                    self.delete_task(temp_task["projectId"], temp_task["id"])
+                except Exception:
+                    pass
+                cache_set(self._token(), "inboxId", inbox_id)
+            self._inbox_id = inbox_id
         return self._inbox_id
 
     def get_inbox_with_data(self):
         inbox_id = self.get_inbox_id()
-        return self._request("GET", f"/project/{inbox_id}/data")
+        return self._request("GET", _P_PROJECT_DATA(inbox_id))
 
     # ── Projects ──────────────────────────────────────────
 
@@ -66,10 +175,10 @@ class TickTickClient:
         return self._request("GET", "/project")
 
     def get_project(self, project_id):
-        return self._request("GET", f"/project/{project_id}")
+        return self._request("GET", _P_PROJECT(project_id))
 
     def get_project_with_data(self, project_id):
-        return self._request("GET", f"/project/{project_id}/data")
+        return self._request("GET", _P_PROJECT_DATA(project_id))
 
     def create_project(self, params):
         body = {"name": params["name"]}
@@ -79,27 +188,27 @@ class TickTickClient:
         return self._request("POST", "/project", body)
 
     def update_project(self, project_id, updates):
-        return self._request("POST", f"/project/{project_id}", updates)
+        return self._request("POST", _P_PROJECT(project_id), updates)
 
     def delete_project(self, project_id):
-        return self._request("DELETE", f"/project/{project_id}")
+        return self._request("DELETE", _P_PROJECT(project_id))
 
     # ── Tasks ─────────────────────────────────────────────
 
     def get_task(self, project_id, task_id):
-        return self._request("GET", f"/project/{project_id}/task/{task_id}")
+        return self._request("GET", _P_PROJECT_TASK(project_id, task_id))
 
     def create_task(self, task):
         return self._request("POST", "/task", task)
 
     def update_task(self, task_id, updates):
-        return self._request("POST", f"/task/{task_id}", updates)
+        return self._request("POST", _P_TASK(task_id), updates)
 
     def complete_task(self, project_id, task_id):
-        return self._request("POST", f"/project/{project_id}/task/{task_id}/complete")
+        return self._request("POST", _P_COMPLETE_TASK(project_id, task_id))
 
     def delete_task(self, project_id, task_id):
-        return self._request("DELETE", f"/project/{project_id}/task/{task_id}")
+        return self._request("DELETE", _P_PROJECT_TASK(project_id, task_id))
 
     # ── Today ─────────────────────────────────────────────
 
@@ -119,29 +228,51 @@ class TickTickClient:
         """Get all uncompleted tasks due today or earlier (overdue)."""
         now = datetime.now(timezone.utc)
         end_of_today = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+        # UTC timestamps sort chronologically as strings, so most tasks need no parsing
+        cutoff = end_of_today.strftime("%Y-%m-%dT%H:%M:%S")
 
         projects = self._request("GET", "/project") or []
-        # Include inbox
+        # Include inbox; archived (closed) projects never show up in Today
         inbox_id = self.get_inbox_id()
-        project_ids = [inbox_id] + [p["id"] for p in projects]
+        project_ids = [inbox_id] + [p["id"] for p in projects if not p.get("closed")]
 
-        tasks = []
-        seen = set()
-        for pid in project_ids:
+        def fetch_due(pid):
+            # Filter inside the worker so only matching tasks outlive the response
             try:
-                data = self._request("GET", f"/project/{pid}/data")
+                data = self._request("GET", _P_PROJECT_DATA(pid))
             except Exception:
-                continue
-            for task in data.get("tasks", []):
-                if task["id"] in seen:
-                    continue
-                seen.add(task["id"])
+                return []
+            due_tasks = []
+            for task in (data or {}).get("tasks", []):
                 # status 0 = normal, 2 = completed
                 if task.get("status", 0) == 2:
                     continue
-                due = self._parse_date(task.get("dueDate"))
+                due_str = task.get("dueDate")
+                if not due_str:
+                    continue
+                if len(due_str) >= 19 and due_str.endswith("+0000"):
+                    if due_str[:19] <= cutoff:
+                        due_tasks.append(task)
+                    continue
+                due = self._parse_date(due_str)
                 if due and due <= end_of_today:
-                    tasks.append(task)
+                    due_tasks.append(task)
+            return due_tasks
+
+        # Project fetches are independent; run them concurrently
+        with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(project_ids))) as pool:
+            results = list(pool.map(fetch_due, project_ids))
+
+        tasks = []
+        seen = set()
+        seen_add = seen.add
+        for due_tasks in results:
+            for task in due_tasks:
+                tid = task["id"]
+                if tid in seen:
+                    continue
+                seen_add(tid)
+                tasks.append(task)
 
         tasks.sort(key=lambda t: t.get("dueDate") or "")
         return tasks
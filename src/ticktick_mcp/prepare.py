@@ -11,14 +11,16 @@ _BRIEF_RE = re.compile(r"<brief>(.*?)</brief>", re.DOTALL)
 _BRIEF_MAX = int(os.environ.get("MCP_TICKTICK_BRIEF_MAX", "100"))
 _DEFAULT_TZ = os.environ.get("MCP_TICKTICK_TIMEZONE", "")
 
-_SLIM_FIELDS = {"id", "projectId", "title", "status", "priority", "dueDate", "tags", "parentId", "childIds"}
+_SLIM_FIELDS = ("id", "projectId", "title", "status", "priority", "dueDate", "tags", "parentId", "childIds")
 
 _DATE_ONLY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 _NAIVE_DT_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2})?$")
 _HAS_OFFSET_RE = re.compile(r"[+-]\d{2}:?\d{2}$|Z$")
 
-_VALID_PRIORITIES = {0, 1, 3, 5}
-_SKIP_VERIFY = {"content", "desc"}
+_VALID_PRIORITIES = frozenset({0, 1, 3, 5})
+_VIEW_MODES = frozenset({"list", "kanban", "timeline"})
+_PROJECT_KINDS = frozenset({"TASK", "NOTE"})
+_SKIP_VERIFY = frozenset({"content", "desc"})
 _TASK_API_FIELDS = ("title", "projectId", "content", "desc", "startDate", "dueDate",
                     "isAllDay", "priority", "tags", "timeZone", "reminders", "repeatFlag", "items")
 _PROJECT_API_FIELDS = ("name", "color", "viewMode", "kind")
@@ -37,7 +39,8 @@ def _extract_brief(task: dict) -> Optional[str]:
 
 def _slim_task(task: dict) -> dict:
     """Strip task to essential fields for list context."""
-    return {k: v for k, v in task.items() if k in _SLIM_FIELDS}
+    # Walk the short allowlist, not the task's ~25 keys
+    return {k: task[k] for k in _SLIM_FIELDS if k in task}
 
 
 def _inject_brief(brief: str, content: Optional[str]) -> str:
@@ -54,13 +57,13 @@ def _validate_brief(content: Optional[str]) -> None:
     """Raise ValueError if brief requirement is on and content lacks a valid <brief> tag."""
     if _BRIEF_MAX == 0:
         return
-    if not content or not _BRIEF_RE.search(content):
+    m = _BRIEF_RE.search(content) if content else None
+    if not m:
         raise ValueError(
             "content must contain a <brief>one-line summary</brief> tag. "
             "Either pass the brief parameter or add the tag to content."
         )
-    m = _BRIEF_RE.search(content)
-    brief = m.group(1).strip() if m else ""
+    brief = m.group(1).strip()
     if len(brief) > _BRIEF_MAX:
         raise ValueError(
             f"<brief> too long: {len(brief)} chars, max {_BRIEF_MAX}. "
@@ -138,6 +141,11 @@ def _require(params: dict, *keys) -> None:
         raise ValueError(f"Required: {', '.join(repr(k) for k in missing)}. Got: {got}")
 
 
+def _pick(params: dict, fields: tuple) -> dict:
+    """Copy the given fields from params, skipping missing and None values."""
+    return {k: params[k] for k in fields if params.get(k) is not None}
+
+
 def _prepare_task(params: dict, is_update: bool = False) -> dict:
     """Build a validated, normalized task dict for the API."""
     params = dict(params)
@@ -172,27 +180,19 @@ def _prepare_task(params: dict, is_update: bool = False) -> dict:
         _require(params, "projectId", "taskId")
     else:
         _require(params, "title")
-    task = {}
-    for key in _TASK_API_FIELDS:
-        if params.get(key) is not None:
-            task[key] = params[key]
-    return task
+    return _pick(params, _TASK_API_FIELDS)
 
 
 def _prepare_project(params: dict, is_update: bool = False) -> dict:
     """Build a validated project dict for the API."""
     params = dict(params)
     if params.get("viewMode") is not None:
-        _validate_enum(params["viewMode"], "viewMode", {"list", "kanban", "timeline"})
+        _validate_enum(params["viewMode"], "viewMode", _VIEW_MODES)
     if params.get("kind") is not None:
-        _validate_enum(params["kind"], "kind", {"TASK", "NOTE"})
+        _validate_enum(params["kind"], "kind", _PROJECT_KINDS)
     if not is_update:
         _require(params, "name")
-    proj = {}
-    for key in _PROJECT_API_FIELDS:
-        if params.get(key) is not None:
-            proj[key] = params[key]
-    return proj
+    return _pick(params, _PROJECT_API_FIELDS)
 
 
 def _verify_response(sent: dict, received) -> None:
@@ -1,15 +1,31 @@
 """TickTick MCP server — auto-discovery, grouping, and dispatch."""
 
+import functools
+import hashlib
 import inspect
+import json
+import os
+import threading
 import typing
+from collections import deque
 
+import anyio
 from mcp.server.fastmcp import FastMCP
 
 from . import tools as _tools_module
+from .codec import dumps_text
 from .registry import ROOT
 
 mcp = FastMCP("ticktick")
 
+_LOOP_LIMIT = int(os.environ.get("MCP_TICKTICK_LOOP_LIMIT", "3"))
+_PRETTY = os.environ.get("MCP_TICKTICK_PRETTY", "").lower() in ("1", "true", "yes")
+
+# Operations are blocking HTTP calls; run them on worker threads so concurrent
+# tool calls overlap instead of queueing on the event loop.
+_MAX_CONCURRENCY = 16
+_limiter = anyio.CapacityLimiter(_MAX_CONCURRENCY)
+
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -19,6 +35,11 @@ def _to_pascal(name: str) -> str:
     return "".join(w.capitalize() for w in name.split("_"))
 
 
+def _json(data) -> str:
+    """Serialize an operation result for the tool response. Compact unless MCP_TICKTICK_PRETTY is set."""
+    return dumps_text(data, indent=_PRETTY)
+
+
 def _parse_bool(val, default: bool) -> bool:
     if val is None:
         return default
@@ -60,6 +81,11 @@ def _coerce_call(fn, params: dict):
 
 _group_ops: dict[str, dict] = {}    # {group_name: {PascalName: fn}}
 _all_grouped: dict[str, str] = {}   # {PascalName: group_name}
+_group_help: dict[str, str] = {}    # {group_name: help text}, static after registration
+# json.dumps with non-default options builds a new encoder per call; bind one
+_canonical_json = json.JSONEncoder(sort_keys=True, default=str).encode
+_recent_calls: deque = deque(maxlen=max(_LOOP_LIMIT, 1))  # [(call_key, failed)]
+_recent_calls_lock = threading.Lock()  # ops run on worker threads; guard reads and appends
 
 
 def _build_help(group_name: str) -> str:
@@ -84,27 +110,70 @@ def _build_help(group_name: str) -> str:
     return f"{len(ops)} operations available:\n" + "\n".join(lines)
 
 
+def _call_key(operation: str, params: dict) -> bytes:
+    raw = _canonical_json([operation, params])
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+def _is_looping(key: bytes) -> bool:
+    """True if the last _LOOP_LIMIT calls were this exact call, and all failed."""
+    if _LOOP_LIMIT <= 0:
+        return False
+    with _recent_calls_lock:
+        if len(_recent_calls) < _LOOP_LIMIT:
+            return False
+        return all(entry == (key, True) for entry in _recent_calls)
+
+
+def _record_call(key: bytes, failed: bool) -> None:
+    with _recent_calls_lock:
+        _recent_calls.append((key, failed))
+
+
 def _dispatch(operation: str, group_name: str, params: dict):
-    """Dispatch an operation call to the right function."""
+    """Dispatch an operation call to the right function; non-str results are JSON-encoded."""
     ops = _group_ops[group_name]
     if operation not in ops:
         if operation in _all_grouped:
             correct = _all_grouped[operation]
-            return {
+            return _json({
                 "error": f"{operation} belongs to {correct}. Use {correct}() instead."
-            }
-        return {
+            })
+        return _json({
             "error": f"Unknown operation: {operation}. "
                      "Use operation=\"help\" to list available operations."
-        }
+        })
 
     fn = ops[operation]
-    return _coerce_call(fn, params)
+    key = _call_key(operation, params)
+    if _is_looping(key):
+        return _json({
+            "error": f"{operation} already failed {_LOOP_LIMIT} times in a row with these "
+                     "exact params; not retrying. Fix the params or stop."
+        })
+    try:
+        result = _coerce_call(fn, params)
+    except Exception:
+        _record_call(key, True)
+        raise
+    _record_call(key, False)
+    return result if isinstance(result, str) else _json(result)
 
 
 # ── Registration ─────────────────────────────────────────────────────────────
 
 
+def _make_root_tool(fn):
+    """Wrap a standalone op to run on a worker thread and encode it like grouped ops."""
+    @functools.wraps(fn)
+    async def tool_fn(**kwargs):
+        result = await anyio.to_thread.run_sync(
+            functools.partial(fn, **kwargs), limiter=_limiter
+        )
+        return result if isinstance(result, str) else _json(result)
+    return tool_fn
+
+
 def _register_tools():
     """Discover @_op-decorated functions, validate, and register as MCP tools."""
     groups: dict[str, tuple] = {}  # {group_name: (Group, {snake_name: fn})}
@@ -114,7 +183,7 @@ def _register_tools():
             continue
         group = fn._mcp_group
         if group is ROOT:
-            mcp.tool()(fn)
+            mcp.tool()(_make_root_tool(fn))
         else:
             if group.name not in groups:
                 groups[group.name] = (group, {})
@@ -126,12 +195,15 @@ def _register_tools():
         _group_ops[group_name] = ops
         for pascal_name in ops:
             _all_grouped[pascal_name] = group_name
+        _group_help[group_name] = _build_help(group_name)
 
         def _make_tool(gname, gdoc):
-            def tool_fn(operation: str, params: dict = {}):
+            async def tool_fn(operation: str, params: dict = {}):
                 if operation == "help":
-                    return _build_help(gname)
-                return _dispatch(operation, gname, params)
+                    return _group_help[gname]
+                return await anyio.to_thread.run_sync(
+                    _dispatch, operation, gname, params, limiter=_limiter
+                )
             tool_fn.__name__ = gname
             tool_fn.__qualname__ = gname
             tool_fn.__doc__ = gdoc
@@ -1,6 +1,8 @@
 """TickTick tool operations. All public functions are auto-registered as MCP tools."""
 
+import atexit
 import os
+import threading
 from typing import Optional
 
 from .client import TickTickClient
@@ -13,18 +15,31 @@ from .prepare import (
 from .registry import ROOT, Group, _op
 
 _client: Optional[TickTickClient] = None
+_client_lock = threading.Lock()
 
 
 def _get_client() -> TickTickClient:
     global _client
     if _client is None:
-        _client = TickTickClient(
-            os.environ.get("TICKTICK_CLIENT_ID"),
-            os.environ.get("TICKTICK_CLIENT_SECRET"),
-        )
+        # Operations run on worker threads; one client means one inbox lock and pool
+        with _client_lock:
+            if _client is None:
+                client = TickTickClient(
+                    os.environ.get("TICKTICK_CLIENT_ID"),
+                    os.environ.get("TICKTICK_CLIENT_SECRET"),
+                )
+                atexit.register(client.close)
+                _client = client
     return _client
 
 
+def _slim_project_data(data: dict) -> dict:
+    """Slim the tasks of a freshly decoded /project/{id}/data response in place."""
+    if "tasks" in data:
+        data["tasks"] = [_slim_task(t) for t in data["tasks"]]
+    return data
+
+
 # ── Groups ───────────────────────────────────────────────────────────────────
 
 ticktick_read = Group(
@@ -82,11 +97,7 @@ def get_today():
 @_op(ticktick_read)
 def get_inbox():
     """Get the Inbox project with all its tasks. The Inbox is NOT included in ListProjects."""
-    data = _get_client().get_inbox_with_data()
-    if "tasks" in data:
-        data = dict(data)
-        data["tasks"] = [_slim_task(t) for t in data["tasks"]]
-    return data
+    return _slim_project_data(_get_client().get_inbox_with_data())
 
 
 @_op(ticktick_read)
@@ -110,11 +121,7 @@ def get_project(projectId: str):
 @_op(ticktick_read)
 def get_project_with_data(projectId: str):
     """Get a TickTick project with all its tasks and columns. For inbox tasks, use GetInbox."""
-    data = _get_client().get_project_with_data(projectId)
-    if "tasks" in data:
-        data = dict(data)
-        data["tasks"] = [_slim_task(t) for t in data["tasks"]]
-    return data
+    return _slim_project_data(_get_client().get_project_with_data(projectId))
 
 
 @_op(ticktick_read)
@@ -187,6 +194,8 @@ def update_task(
         existing = _get_client().get_task(projectId, taskId)
         params["content"] = existing.get("content") or ""
     task = _prepare_task(params, is_update=True)
+    if task.keys() == {"projectId"}:
+        return f"Task {taskId} unchanged: no fields to update."
     result = _get_client().update_task(taskId, task)
     _verify_response(task, result)
     return result
@@ -223,6 +232,8 @@ def update_project(
 ):
     """Update an existing TickTick project. viewMode: list, kanban, or timeline. kind: TASK or NOTE."""
     proj = _prepare_project(locals(), is_update=True)
+    if not proj:
+        return f"Project {projectId} unchanged: no fields to update."
     result = _get_client().update_project(projectId, proj)
     _verify_response(proj, result)
     return result
@@ -42,6 +42,16 @@ def test_extract_brief_multiline():
     assert _extract_brief(task) == "line1\nline2"
 
 
+def test_extract_brief_unclosed_falls_through_to_desc():
+    task = {"content": "<brief>never closed", "desc": "<brief>From desc</brief>"}
+    assert _extract_brief(task) == "From desc"
+
+
+def test_extract_brief_first_tag_wins():
+    task = {"content": "<brief>A</brief> and <brief>B</brief>"}
+    assert _extract_brief(task) == "A"
+
+
 # ── _inject_brief ─────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,68 @@
+"""Tests for the on-disk per-account cache."""
+
+import pytest
+
+from ticktick_mcp import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "sub" / "cache.json"
+    monkeypatch.setattr(cache, "CACHE_FILE", path)
+    return path
+
+
+def test_missing_file_is_empty():
+    assert cache.load_cache() == {}
+    assert cache.cache_get("tok", "inboxId") is None
+
+
+def test_roundtrip(cache_file):
+    cache.cache_set("tok", "inboxId", "inbox1")
+    assert cache.cache_get("tok", "inboxId") == "inbox1"
+    assert cache.cache_get("other", "inboxId") is None
+
+
+def test_token_not_stored_in_plaintext(cache_file):
+    cache.cache_set("secret-token", "inboxId", "inbox1")
+    assert "secret-token" not in cache_file.read_text()
+
+
+def test_non_dict_file_ignored(cache_file):
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text("[1, 2]")
+    assert cache.load_cache() == {}
+
+
+def test_unchanged_save_skips_write(cache_file, monkeypatch):
+    cache.save_cache({"a": {"inboxId": "x"}})
+    calls = []
+    monkeypatch.setattr(cache.os, "replace", lambda *a: calls.append(a))
+    cache.save_cache({"a": {"inboxId": "x"}})
+    assert calls == []
+
+
+def test_save_leaves_no_temp_files(cache_file):
+    cache.save_cache({"a": {"inboxId": "x"}})
+    cache.save_cache({"a": {"inboxId": "y"}})
+    assert [p.name for p in cache_file.parent.iterdir()] == ["cache.json"]
+
+
+def test_failed_save_removes_temp_file(cache_file, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache.os, "replace", fail)
+    cache.save_cache({"a": {"inboxId": "x"}})
+    assert list(cache_file.parent.iterdir()) == []
+
+
+def test_malformed_entries_dropped(cache_file):
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text('{"bad": 5, "good": {"inboxId": "x"}}')
+    assert cache.load_cache() == {"good": {"inboxId": "x"}}
+    key = cache._account_key("tok")
+    cache_file.write_text('{"%s": "oops"}' % key)
+    assert cache.cache_get("tok", "inboxId") is None
+    cache.cache_set("tok", "inboxId", "inbox1")
+    assert cache.cache_get("tok", "inboxId") == "inbox1"
@@ -2,21 +2,39 @@
 
 import inspect
 import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
+import anyio
 import pytest
 
 from ticktick_mcp import tools as _tools_module
 from ticktick_mcp.tools import ticktick_read, ticktick_write, ticktick_delete
 from ticktick_mcp.server import (
+    _LOOP_LIMIT,
     _build_help,
     _dispatch,
+    _group_help,
     _group_ops,
+    _is_looping,
     _parse_bool,
+    _recent_calls,
+    _record_call,
     _to_pascal,
+    mcp,
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_calls():
+    """The loop guard's call history is process-global; isolate every test from it."""
+    _recent_calls.clear()
+    yield
+    _recent_calls.clear()
+
+
 # ── Registry validation ─────────────────────────────────────────────────────
 
 
@@ -299,6 +317,18 @@ def test_update_project(mock_client):
     mock_client.update_project.assert_called_with("p1", {"name": "Renamed"})
 
 
+def test_update_task_noop_skips_api(mock_client):
+    result = _dispatch("UpdateTask", "ticktick_write", {"taskId": "t1", "projectId": "p1"})
+    assert "unchanged" in result
+    mock_client.update_task.assert_not_called()
+
+
+def test_update_project_noop_skips_api(mock_client):
+    result = _dispatch("UpdateProject", "ticktick_write", {"projectId": "p1"})
+    assert "unchanged" in result
+    mock_client.update_project.assert_not_called()
+
+
 # ── Delete dispatch ──────────────────────────────────────────────────────────
 
 
@@ -321,3 +351,161 @@ def test_empty_params(mock_client):
     mock_client.list_projects.return_value = []
     result = json.loads(_dispatch("ListProjects", "ticktick_read", {}))
     assert result == []
+
+
+def test_help_precomputed():
+    for group_name in _group_ops:
+        assert _group_help[group_name] == _build_help(group_name)
+
+
+# ── Loop guard ───────────────────────────────────────────────────────────────
+
+
+def test_repeated_identical_failure_short_circuits(mock_client):
+    mock_client.get_project.side_effect = Exception("TickTick API error 404")
+    for _ in range(_LOOP_LIMIT):
+        with pytest.raises(Exception, match="404"):
+            _dispatch("GetProject", "ticktick_read", {"projectId": "missing"})
+    result = json.loads(_dispatch("GetProject", "ticktick_read", {"projectId": "missing"}))
+    assert "not retrying" in result["error"]
+    assert mock_client.get_project.call_count == _LOOP_LIMIT
+
+
+def test_loop_guard_allows_different_params(mock_client):
+    mock_client.get_project.side_effect = Exception("TickTick API error 404")
+    for _ in range(_LOOP_LIMIT):
+        with pytest.raises(Exception):
+            _dispatch("GetProject", "ticktick_read", {"projectId": "missing"})
+    with pytest.raises(Exception, match="404"):
+        _dispatch("GetProject", "ticktick_read", {"projectId": "other"})
+
+
+def test_loop_guard_reset_by_success(mock_client):
+    mock_client.get_project.side_effect = Exception("TickTick API error 500")
+    for _ in range(_LOOP_LIMIT):
+        with pytest.raises(Exception):
+            _dispatch("GetProject", "ticktick_read", {"projectId": "p1"})
+    mock_client.list_projects.return_value = []
+    _dispatch("ListProjects", "ticktick_read", {})
+    with pytest.raises(Exception, match="500"):
+        _dispatch("GetProject", "ticktick_read", {"projectId": "p1"})
+
+
+# ── Concurrent tool calls ────────────────────────────────────────────────────
+
+
+def test_meta_tool_calls_run_concurrently(mock_client):
+    # Each call blocks until the other one arrives; only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    def list_projects():
+        barrier.wait()
+        return []
+
+    mock_client.list_projects.side_effect = list_projects
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            for _ in range(2):
+                tg.start_soon(mcp.call_tool, "ticktick_read", {"operation": "ListProjects", "params": {}})
+
+    anyio.run(main)
+    assert mock_client.list_projects.call_count == 2
+
+
+def test_loop_guard_history_thread_safe():
+    # Worker threads record calls while others scan the history; switch threads
+    # as often as possible so an unlocked scan sees the deque mutate under it
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    key = b"same-failing-call"
+    done = threading.Event()
+
+    def record():
+        while not done.is_set():
+            _record_call(key, True)
+
+    def scan():
+        for _ in range(20000):
+            _is_looping(key)
+
+    recorders = [threading.Thread(target=record) for _ in range(2)]
+    for t in recorders:
+        t.start()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for future in [pool.submit(scan) for _ in range(2)]:
+                future.result()  # re-raises "deque mutated during iteration"
+    finally:
+        done.set()
+        for t in recorders:
+            t.join()
+        sys.setswitchinterval(interval)
+
+
+def test_meta_tool_help_via_mcp():
+    result = anyio.run(mcp.call_tool, "ticktick_read", {"operation": "help"})
+    assert "7 operations available" in str(result)
+
+
+# ── Output format ────────────────────────────────────────────────────────────
+
+
+def test_json_compact_by_default(mock_client):
+    mock_client.get_project.return_value = {"id": "p1", "name": "Работа"}
+    text = _dispatch("GetProject", "ticktick_read", {"projectId": "p1"})
+    assert text == '{"id":"p1","name":"Работа"}'
+
+
+def test_root_tool_json_compact_by_default(mock_client):
+    mock_client.list_projects.return_value = []
+    content = anyio.run(mcp.call_tool, "ticktick_version", {})
+    text = content[0].text
+    assert "\n" not in text
+    assert json.loads(text)["service"] == {"status": "ok"}
+
+
+def test_root_tool_json_pretty_opt_in(mock_client, monkeypatch):
+    monkeypatch.setattr("ticktick_mcp.server._PRETTY", True)
+    mock_client.list_projects.return_value = []
+    content = anyio.run(mcp.call_tool, "ticktick_version", {})
+    assert content[0].text.startswith("{\n  ")
+
+
+def test_json_pretty_opt_in(mock_client, monkeypatch):
+    monkeypatch.setattr("ticktick_mcp.server._PRETTY", True)
+    mock_client.get_project.return_value = {"id": "p1"}
+    text = _dispatch("GetProject", "ticktick_read", {"projectId": "p1"})
+    assert text == '{\n  "id": "p1"\n}'
+
+
+# ── Client singleton ─────────────────────────────────────────────────────────
+
+
+def test_get_client_single_instance_under_concurrency(monkeypatch):
+    monkeypatch.setattr(_tools_module, "_client", None)
+    monkeypatch.setattr(_tools_module.atexit, "register", lambda fn: None)
+    barrier = threading.Barrier(8, timeout=5)
+
+    def first_call(_):
+        barrier.wait()
+        return _tools_module._get_client()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(first_call, range(8)))
+    assert len({id(c) for c in clients}) == 1
+
+
+def test_root_tool_runs_off_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def list_projects():
+        seen.append(threading.get_ident())
+        return []
+
+    client = MagicMock()
+    client.list_projects.side_effect = list_projects
+    with patch("ticktick_mcp.tools._get_client", return_value=client):
+        anyio.run(mcp.call_tool, "ticktick_version", {})
+    assert seen and seen[0] != loop_thread